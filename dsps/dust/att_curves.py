@@ -24,6 +24,7 @@ from ..utils import _tw_sig_slope
 
 
 RV_C00 = 4.05
+INV_RV_C00 = 1 / RV_C00
 UV_BUMP_W0 = 0.2175  # Center of UV bump in micron
 UV_BUMP_DW = 0.0350  # Width of UV bump in micron
 
@@ -92,8 +93,9 @@ def _l02_below_c00_above(wave_micron, xc=0.15):
     Used by noll09_k_lambda and sbl18_k_lambda
 
     """
-    k_lambda_c00 = calzetti00_k_lambda(wave_micron)
-    k_lambda_l02 = leitherer02_k_lambda(wave_micron)
+    y = 1 / wave_micron
+    k_lambda_c00 = _calzetti00_k_lambda_from_inv_wave(y)
+    k_lambda_l02 = _leitherer02_k_lambda_from_inv_wave(y)
     k_lambda = jnp.where(wave_micron > xc, k_lambda_c00, k_lambda_l02)
     return k_lambda
 
@@ -378,10 +380,18 @@ def calzetti00_k_lambda(wave_micron):
         k(λ) = A(λ) * (4.05/av)
 
     """
-    y = 1 / wave_micron
-    k1 = 2.659 * (-2.156 + 1.509 * y - 0.198 * y**2 + 0.011 * y**3) + RV_C00
+    return _calzetti00_k_lambda_from_inv_wave(1 / wave_micron)
+
+
+@jjit
+def _calzetti00_k_lambda_from_inv_wave(y):
+    """Calzetti (2000) k(λ) as a function of y = 1/λ in inverse micron.
+
+    Polynomials are evaluated in Horner form so that both branches
+    share the single reciprocal computed by the caller."""
+    k1 = 2.659 * (-2.156 + y * (1.509 + y * (-0.198 + y * 0.011))) + RV_C00
     k2 = 2.659 * (-1.857 + 1.040 * y) + RV_C00
-    k_lambda = jnp.where(wave_micron < 0.63, k1, k2)
+    k_lambda = jnp.where(y > 1 / 0.63, k1, k2)
     return k_lambda
 
 
@@ -402,8 +412,13 @@ def leitherer02_k_lambda(wave_micron):
         k(λ) = A(λ) * (4.05/av)
 
     """
-    y = 1 / wave_micron
-    k_lambda = 5.472 + (0.671 * y - 9.218 * 1e-3 * y**2 + 2.620 * 1e-3 * y**3)
+    return _leitherer02_k_lambda_from_inv_wave(1 / wave_micron)
+
+
+@jjit
+def _leitherer02_k_lambda_from_inv_wave(y):
+    """Leitherer (2002) k(λ) in Horner form as a function of y = 1/λ in 1/micron"""
+    k_lambda = 5.472 + y * (0.671 + y * (-9.218 * 1e-3 + y * 2.620 * 1e-3))
     return k_lambda
 
 
@@ -439,7 +454,7 @@ def _att_curve_from_k_lambda(k_lambda, av):
     A(λ) = k(λ) * (av/4.05)
 
     """
-    att_curve = av * k_lambda / RV_C00
+    att_curve = av * k_lambda * INV_RV_C00
     att_curve = jnp.where(att_curve < 0, 0, att_curve)
     return att_curve
 
@@ -450,7 +465,9 @@ def _drude_bump(x, x0, gamma, ampl):
 
     The UV bump is typically located at λ=0.2175 micron,
     but _drude_bump can be used to introduce a generic bump in a power-law type model"""
-    bump = x**2 * gamma**2 / ((x**2 - x0**2) ** 2 + x**2 * gamma**2)
+    x2g2 = x * x * gamma * gamma
+    dx2 = x * x - x0 * x0
+    bump = x2g2 * jnp.reciprocal(dx2 * dx2 + x2g2)
     return ampl * bump
 
 
@@ -0,0 +1,37 @@
+"""
+"""
+import numpy as np
+import pytest
+
+from .._numba_kernels import HAS_NUMBA, _sbl18_frac_transmission_numba
+from .._numba_kernels import _sbl18_k_lambda_numba
+from ..att_curves import UV_BUMP_DW, UV_BUMP_W0, sbl18_k_lambda
+from ..att_curves import _frac_transmission_from_k_lambda
+
+NO_NUMBA_MSG = "Must have numba installed to run this unit test"
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason=NO_NUMBA_MSG)
+def test_sbl18_k_lambda_numba_agrees_with_jax():
+    wave_micron = np.logspace(-1.5, 1, 1_000)
+    for uv_bump_ampl, plaw_slope in ((0.0, 0.0), (2.0, -0.5), (4.0, 0.3)):
+        k_jax = sbl18_k_lambda(wave_micron, uv_bump_ampl, plaw_slope)
+        k_numba = np.zeros_like(wave_micron)
+        _sbl18_k_lambda_numba(
+            wave_micron, uv_bump_ampl, plaw_slope, UV_BUMP_W0, UV_BUMP_DW, k_numba
+        )
+        assert np.allclose(k_jax, k_numba, rtol=1e-4)
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason=NO_NUMBA_MSG)
+def test_sbl18_frac_transmission_numba_agrees_with_jax():
+    wave_micron = np.logspace(-1.5, 1, 1_000)
+    uv_bump_ampl, plaw_slope, av, ftrans_floor = 2.0, -0.3, 0.8, 0.1
+    k_lambda = sbl18_k_lambda(wave_micron, uv_bump_ampl, plaw_slope)
+    ftrans_jax = _frac_transmission_from_k_lambda(k_lambda, av, ftrans_floor)
+    ftrans_numba = _sbl18_frac_transmission_numba(
+        wave_micron, uv_bump_ampl, plaw_slope, av, ftrans_floor=ftrans_floor
+    )
+    assert np.allclose(ftrans_jax, ftrans_numba, rtol=1e-4)
+    assert np.all(ftrans_numba >= ftrans_floor)
+    assert np.all(ftrans_numba <= 1)
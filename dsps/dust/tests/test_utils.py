@@ -3,6 +3,10 @@
 import numpy as np
 from jax.scipy.stats import norm
 from ..utils import get_filter_effective_wavelength
+from ..utils import _get_effective_attenuation, _get_effective_attenuation_batched
+from ..utils import _get_effective_attenuation_from_lambda_eff_batched
+from ..utils import _get_effective_attenuation_from_lambda_eff_rest_batched
+from ..utils import _get_filter_effective_wavelength_rest
 
 
 def test_get_filter_effective_wavelength_tophat_transmission_curve():
@@ -29,3 +33,71 @@ def test_get_filter_effective_wavelength_gaussian_transmission_curve():
     lambda_eff = get_filter_effective_wavelength(wave, trans, redshift)
     mu_eff_correct = mu_rest / (1 + redshift)
     assert np.allclose(mu_eff_correct, lambda_eff, atol=0.01)
+
+
+def test_get_effective_attenuation_batched_agrees_with_scalar_kernel():
+    n_filters, n_gals = 3, 10
+    wave = np.linspace(1_000, 10_000, 500)
+    mus = np.linspace(3_000, 8_000, n_filters)
+    filter_waves = np.array([wave for mu in mus])
+    filter_trans = np.array([norm.pdf(wave, mu, 300) for mu in mus])
+
+    redshift = np.random.uniform(0, 3, n_gals)
+    uv_bump_ampl = np.random.uniform(0, 3, n_gals)
+    plaw_slope = np.random.uniform(-1, 0.5, n_gals)
+    av = np.random.uniform(0, 2, n_gals)
+    dust_params = np.array((uv_bump_ampl, plaw_slope, av)).T
+
+    ftrans = _get_effective_attenuation_batched(
+        filter_waves, filter_trans, redshift, dust_params
+    )
+    assert ftrans.shape == (n_filters, n_gals)
+    assert np.all(ftrans > 0)
+    assert np.all(ftrans <= 1)
+
+    lambda_eff = np.array(
+        [
+            [get_filter_effective_wavelength(w, t, z) for z in redshift]
+            for w, t in zip(filter_waves, filter_trans)
+        ]
+    )
+    ftrans2 = _get_effective_attenuation_from_lambda_eff_batched(
+        lambda_eff, dust_params
+    )
+    assert np.allclose(ftrans, ftrans2, rtol=1e-4)
+
+    for ifilter in range(n_filters):
+        for igal in range(n_gals):
+            ftrans_correct = _get_effective_attenuation(
+                filter_waves[ifilter],
+                filter_trans[ifilter],
+                redshift[igal],
+                dust_params[igal],
+            )
+            assert np.allclose(ftrans[ifilter, igal], ftrans_correct, rtol=1e-4)
+
+
+def test_get_effective_attenuation_from_precomputed_lambda_eff_rest():
+    n_filters, n_gals = 2, 5
+    wave = np.linspace(1_000, 10_000, 500)
+    mus = np.linspace(3_000, 8_000, n_filters)
+    filter_waves = np.array([wave for mu in mus])
+    filter_trans = np.array([norm.pdf(wave, mu, 300) for mu in mus])
+
+    lambda_eff_rest = np.array(
+        [
+            _get_filter_effective_wavelength_rest(w, t)
+            for w, t in zip(filter_waves, filter_trans)
+        ]
+    )
+    assert np.allclose(lambda_eff_rest, mus, rtol=1e-3)
+
+    redshift = np.random.uniform(0, 3, n_gals)
+    dust_params = np.array((np.ones(n_gals), np.zeros(n_gals), np.ones(n_gals))).T
+    ftrans = _get_effective_attenuation_from_lambda_eff_rest_batched(
+        lambda_eff_rest, redshift, dust_params
+    )
+    ftrans_correct = _get_effective_attenuation_batched(
+        filter_waves, filter_trans, redshift, dust_params
+    )
+    assert np.allclose(ftrans, ftrans_correct)
@@ -1,8 +1,10 @@
 """
 """
 from jax import jit as jjit
+from jax import vmap
 
 from ..utils import trapz
+from .att_curves import _frac_transmission_from_k_lambda, sbl18_k_lambda
 
 
 @jjit
@@ -24,7 +26,121 @@ def get_filter_effective_wavelength(filter_wave, filter_trans, redshift):
     lambda_eff : float
 
     """
-    norm = trapz(filter_wave, filter_trans)
-    lambda_eff_rest = trapz(filter_wave, filter_trans * filter_wave) / norm
+    lambda_eff_rest = _get_filter_effective_wavelength_rest(filter_wave, filter_trans)
     lambda_eff = lambda_eff_rest / (1 + redshift)
     return lambda_eff
+
+
+@jjit
+def _get_filter_effective_wavelength_rest(filter_wave, filter_trans):
+    """Effective wavelength of a filter in its own frame.
+
+    Depends only on the filter, so for a fixed set of filters this can be
+    computed once and divided by (1 + redshift) for each galaxy.
+
+    """
+    norm = trapz(filter_wave, filter_trans)
+    lambda_eff_rest = trapz(filter_wave, filter_trans * filter_wave) / norm
+    return lambda_eff_rest
+
+
+@jjit
+def _get_effective_attenuation(filter_wave, filter_trans, redshift, dust_params):
+    """Fraction of flux transmitted through dust, approximating the Salim+18
+    attenuation curve as a constant evaluated at the effective wavelength
+
+    Parameters
+    ----------
+    filter_wave : ndarray of shape (n, )
+        Wavelength of the filter transmission curve in Angstroms
+
+    filter_trans : ndarray of shape (n, )
+
+    redshift : float
+
+    dust_params : ndarray of shape (3, )
+        dust_params = (uv_bump_ampl, plaw_slope, av)
+
+    Returns
+    -------
+    ftrans : float
+
+    """
+    lambda_eff = get_filter_effective_wavelength(filter_wave, filter_trans, redshift)
+    return _get_effective_attenuation_from_lambda_eff(lambda_eff, dust_params)
+
+
+@jjit
+def _get_effective_attenuation_from_lambda_eff(lambda_eff, dust_params):
+    """Same as _get_effective_attenuation for a precomputed lambda_eff in Angstroms"""
+    uv_bump_ampl, plaw_slope, av = dust_params
+    lambda_eff_micron = lambda_eff / 10_000
+    k_lambda = sbl18_k_lambda(lambda_eff_micron, uv_bump_ampl, plaw_slope)
+    return _frac_transmission_from_k_lambda(k_lambda, av)
+
+
+# lambda_eff has shape (n_filters, n_gals) and dust_params has shape (n_gals, 3)
+_get_effective_attenuation_from_lambda_eff_batched = jjit(
+    vmap(
+        vmap(_get_effective_attenuation_from_lambda_eff, in_axes=[0, 0]),
+        in_axes=[0, None],
+    )
+)
+
+_get_filter_effective_wavelength_rest_vmap = jjit(
+    vmap(_get_filter_effective_wavelength_rest, in_axes=[0, 0])
+)
+
+
+@jjit
+def _get_effective_attenuation_from_lambda_eff_rest_batched(
+    lambda_eff_rest, redshift, dust_params
+):
+    """Effective attenuation of a population of galaxies through a set of filters
+    whose effective wavelengths have been precomputed
+
+    Parameters
+    ----------
+    lambda_eff_rest : ndarray of shape (n_filters, )
+        Output of _get_filter_effective_wavelength_rest
+
+    redshift : ndarray of shape (n_gals, )
+
+    dust_params : ndarray of shape (n_gals, 3)
+
+    Returns
+    -------
+    ftrans : ndarray of shape (n_filters, n_gals)
+
+    """
+    lambda_eff = lambda_eff_rest.reshape((-1, 1)) / (1 + redshift.reshape((1, -1)))
+    return _get_effective_attenuation_from_lambda_eff_batched(lambda_eff, dust_params)
+
+
+@jjit
+def _get_effective_attenuation_batched(
+    filter_waves, filter_trans, redshift, dust_params
+):
+    """Effective attenuation of a population of galaxies through a set of filters
+
+    Parameters
+    ----------
+    filter_waves : ndarray of shape (n_filters, n)
+
+    filter_trans : ndarray of shape (n_filters, n)
+
+    redshift : ndarray of shape (n_gals, )
+
+    dust_params : ndarray of shape (n_gals, 3)
+
+    Returns
+    -------
+    ftrans : ndarray of shape (n_filters, n_gals)
+
+    """
+    lambda_eff_rest = _get_filter_effective_wavelength_rest_vmap(
+        filter_waves, filter_trans
+    )
+    return _get_effective_attenuation_from_lambda_eff_rest_batched(
+        lambda_eff_rest, redshift, dust_params
+    )
@@ -1,14 +1,21 @@
 """Kernels of common photometry integrals"""
+from functools import partial
+
+import numpy as np
 from jax import jit as jjit
+from jax import lax
 from jax import numpy as jnp
+from jax import vmap
 
 from ..cosmology.flat_wcdm import distance_modulus_to_z
-from ..utils import trapz
 
 AB0 = 1.13492e-13  # 3631 Jansky placed at 10 pc in units of Lsun/Hz
 
+# Default redshift grid used to tabulate the distance modulus
+Z_DIMMING_TABLE = np.logspace(-4, np.log10(20.0), 2048)
+
 
-__all__ = ("calc_obs_mag", "calc_rest_mag")
+__all__ = ("calc_obs_mag", "calc_rest_mag", "make_calc_obs_mag")
 
 
 @jjit
@@ -42,16 +49,156 @@ def calc_obs_mag(
     obs_mag : float
 
     """
-    flux_source = _obs_flux_ssp(
-        wave_spec_rest, lum_spec, wave_filter, trans_filter, redshift
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    flux_source = _obs_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w, redshift
     )
-    flux_ab0 = _flux_ab0_at_10pc(wave_filter, trans_filter)
-    mag_no_dimming = -2.5 * jnp.log10(flux_source / flux_ab0)
+    flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
     dimming = _cosmological_dimming(redshift, Om0, w0, wa, h)
-    obs_mag = mag_no_dimming + dimming
+    obs_mag = _calc_obs_mag_core(flux_source, flux_ab0, dimming)
+    return obs_mag
+
+
+def make_calc_obs_mag(wave_filter, trans_filter):
+    """Build a version of calc_obs_mag specialized to a fixed filter
+
+    The filter arrays and their integration weights are captured in a closure,
+    so that XLA treats them as compile-time constants. This is convenient for
+    analyses that use the same filter throughout, e.g., an entire survey.
+
+    Parameters
+    ----------
+    wave_filter : ndarray of shape (n_filter_wave, )
+
+    trans_filter : ndarray of shape (n_filter_wave, )
+
+    Returns
+    -------
+    calc_obs_mag_filter : callable
+        Jitted function with signature
+        calc_obs_mag_filter(wave_spec_rest, lum_spec, redshift, Om0, w0, wa, h)
+        returning the same apparent magnitude as calc_obs_mag
+
+    """
+    wave_filter = jnp.asarray(wave_filter)
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
+
+    @jjit
+    def calc_obs_mag_filter(wave_spec_rest, lum_spec, redshift, Om0, w0, wa, h):
+        flux_source = _obs_flux_ssp_from_trapz_weights(
+            wave_spec_rest, lum_spec, wave_filter, trap_w, redshift
+        )
+        dimming = _cosmological_dimming(redshift, Om0, w0, wa, h)
+        return _calc_obs_mag_core(flux_source, flux_ab0, dimming)
+
+    return calc_obs_mag_filter
+
+
+@jjit
+def _calc_obs_mag_core(flux_source, flux_ab0, dimming):
+    """Apparent magnitude from precomputed source flux, AB flux and dimming
+
+    Parameters
+    ----------
+    flux_source : ndarray
+        Flux of the source through the filter, e.g., from _obs_flux_ssp
+
+    flux_ab0 : ndarray
+        Flux of the AB standard through the filter, from _flux_ab0_at_10pc.
+        Depends only on the filter and so can be computed once per filter
+
+    dimming : ndarray
+        Cosmological dimming, from _cosmological_dimming.
+        Depends only on redshift and so can be computed once per redshift
+
+    Returns
+    -------
+    obs_mag : ndarray
+        Inputs are broadcast against each other
+
+    """
+    return -2.5 * jnp.log10(flux_source / flux_ab0) + dimming
+
+
+@jjit
+def _calc_obs_mag_tabulated(
+    wave_spec_rest,
+    lum_spec,
+    wave_filter,
+    trans_filter,
+    redshift,
+    z_table,
+    distance_modulus_table,
+):
+    """Calculate the apparent magnitude of an SED observed through a filter,
+    interpolating the cosmological dimming from a precomputed lookup table
+
+    Parameters
+    ----------
+    wave_spec_rest : ndarray of shape (n_wave, )
+
+    lum_spec : ndarray of shape (n_wave, )
+
+    wave_filter : ndarray of shape (n_filter_wave, )
+
+    trans_filter : ndarray of shape (n_filter_wave, )
+
+    redshift : float
+        Should lie within the range spanned by z_table
+
+    z_table : ndarray of shape (n_z, )
+
+    distance_modulus_table : ndarray of shape (n_z, )
+        Output of _get_distance_modulus_table
+
+    Returns
+    -------
+    obs_mag : float
+
+    """
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    flux_source = _obs_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w, redshift
+    )
+    flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
+    dimming = _cosmological_dimming_from_table(
+        redshift, z_table, distance_modulus_table
+    )
+    obs_mag = _calc_obs_mag_core(flux_source, flux_ab0, dimming)
     return obs_mag
 
 
+_distance_modulus_to_z_vmap = jjit(
+    vmap(distance_modulus_to_z, in_axes=[0, *[None] * 4])
+)
+
+
+@jjit
+def _get_distance_modulus_table(Om0, w0, wa, h, z_table=Z_DIMMING_TABLE):
+    """Tabulate the distance modulus for use with _calc_obs_mag_tabulated
+
+    Parameters
+    ----------
+    Om0 : float
+
+    w0 : float
+
+    wa : float
+
+    h : float
+
+    z_table : ndarray of shape (n_z, ), optional
+        Default is Z_DIMMING_TABLE, 2048 log-spaced points with 1e-4 < z < 20
+
+    Returns
+    -------
+    distance_modulus_table : ndarray of shape (n_z, )
+
+    """
+    return _distance_modulus_to_z_vmap(z_table, Om0, w0, wa, h)
+
+
 @jjit
 def _cosmological_dimming_from_table(z, z_table, distance_modulus_table):
     distance_modulus = jnp.interp(z, z_table, distance_modulus_table)
@@ -66,9 +213,12 @@ def _cosmological_dimming(z, Om0, w0, wa, h):
 
 @jjit
 def _calc_obs_mag_no_dimming(wave_spec_rest, lum_spec, wave_filter, trans_filter, z):
-    flux_source = _obs_flux_ssp(wave_spec_rest, lum_spec, wave_filter, trans_filter, z)
-    flux_ab0 = _flux_ab0_at_10pc(wave_filter, trans_filter)
-    return -2.5 * jnp.log10(flux_source / flux_ab0)
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    flux_source = _obs_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w, z
+    )
+    flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
+    return _calc_obs_mag_core(flux_source, flux_ab0, 0.0)
 
 
 @jjit
@@ -90,32 +240,191 @@ def calc_rest_mag(wave_spec_rest, lum_spec, wave_filter, trans_filter):
     rest_mag : float
 
     """
-    flux_source = _rest_flux_ssp(wave_spec_rest, lum_spec, wave_filter, trans_filter)
-    flux_ab0 = _flux_ab0_at_10pc(wave_filter, trans_filter)
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    flux_source = _rest_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w
+    )
+    flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
     rest_mag = -2.5 * jnp.log10(flux_source / flux_ab0)
     return rest_mag
 
 
 @jjit
-def _obs_flux_ssp(wave_spec_rest, lum_spec, wave_filter, trans_filter, z):
-    lum_zshift_phot = jnp.interp(
-        wave_filter, wave_spec_rest * (1 + z), lum_spec, left=0, right=0
+def _get_filter_trapz_weights(wave_filter, trans_filter):
+    """Weights of the trapezoidal integral of a spectrum observed through a filter
+
+    Parameters
+    ----------
+    wave_filter : ndarray of shape (n_filter_wave, )
+
+    trans_filter : ndarray of shape (n_filter_wave, )
+
+    Returns
+    -------
+    trap_w : ndarray of shape (n_filter_wave, )
+        Weights such that trapz(wave_filter, trans_filter * lum / wave_filter)
+        is equal to jnp.dot(lum, trap_w) for any lum tabulated on wave_filter
+
+    """
+    dwave = jnp.diff(wave_filter)
+    dwave_trapz = 0.5 * (jnp.pad(dwave, (1, 0)) + jnp.pad(dwave, (0, 1)))
+    trap_w = dwave_trapz * trans_filter / wave_filter
+    return trap_w
+
+
+@partial(jjit, static_argnames=["flux_dtype"])
+def _obs_flux_ssp(
+    wave_spec_rest, lum_spec, wave_filter, trans_filter, z, flux_dtype=None
+):
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    return _obs_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w, z, flux_dtype=flux_dtype
     )
-    integrand = trans_filter * lum_zshift_phot / wave_filter
-    lum_filter = trapz(wave_filter, integrand)
+
+
+@partial(jjit, static_argnames=["flux_dtype"])
+def _rest_flux_ssp(
+    wave_spec_rest, lum_spec, wave_filter, trans_filter, flux_dtype=None
+):
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    return _rest_flux_ssp_from_trapz_weights(
+        wave_spec_rest, lum_spec, wave_filter, trap_w, flux_dtype=flux_dtype
+    )
+
+
+@partial(jjit, static_argnames=["flux_dtype"])
+def _obs_flux_ssp_from_trapz_weights(
+    wave_spec_rest, lum_spec, wave_filter, trap_w, z, flux_dtype=None
+):
+    interp_setup = _interp_setup(wave_filter, wave_spec_rest * (1 + z))
+    lum_zshift_phot = _interp_from_setup(lum_spec, *interp_setup)
+    lum_filter = _flux_dot(lum_zshift_phot, trap_w, flux_dtype)
     return lum_filter
 
 
-@jjit
-def _rest_flux_ssp(wave_spec_rest, lum_spec, wave_filter, trans_filter):
-    lum_phot = jnp.interp(wave_filter, wave_spec_rest, lum_spec, left=0, right=0)
-    integrand = trans_filter * lum_phot / wave_filter
-    lum_filter = trapz(wave_filter, integrand)
+@partial(jjit, static_argnames=["flux_dtype"])
+def _rest_flux_ssp_from_trapz_weights(
+    wave_spec_rest, lum_spec, wave_filter, trap_w, flux_dtype=None
+):
+    interp_setup = _interp_setup(wave_filter, wave_spec_rest)
+    lum_phot = _interp_from_setup(lum_spec, *interp_setup)
+    lum_filter = _flux_dot(lum_phot, trap_w, flux_dtype)
     return lum_filter
 
 
+def _flux_dot(lum, weights, flux_dtype=None):
+    """Dot product of a luminosity with integration weights
+
+    By default the product runs at lax.Precision.HIGHEST, so that accelerators
+    do not silently downcast to bfloat16 or TF32.
+
+    When flux_dtype is a reduced-precision dtype such as jnp.bfloat16, both inputs
+    are cast to that dtype, and the result is accumulated and returned in float32.
+    Wavelength grids are never cast, so that the interpolation onto the filter grid
+    keeps full precision. Only the batched matrix products in
+    dsps.photometry.photpop are large enough to run on tensor cores;
+    for a single SED the reduced precision only saves memory traffic.
+
+    """
+    if flux_dtype is None:
+        return jnp.dot(lum, weights, precision=lax.Precision.HIGHEST)
+    lum = lum.astype(flux_dtype)
+    weights = weights.astype(flux_dtype)
+    return jnp.dot(lum, weights, preferred_element_type=jnp.float32)
+
+
+@jjit
+def _get_spec_trapz_weights(wave_spec, wave_filter, trap_w):
+    """Project the trapezoidal weights of a filter onto the wavelength grid of a
+    spectrum. Linear interpolation is linear in the interpolated values, and so
+
+    jnp.dot(jnp.interp(wave_filter, wave_spec, lum, left=0, right=0), trap_w)
+
+    is equal to jnp.dot(lum, spec_w) for any lum tabulated on wave_spec.
+    Photometry of a batch of SEDs through a batch of filters thereby reduces to
+    a single matrix product.
+
+    Parameters
+    ----------
+    wave_spec : ndarray of shape (n_wave, )
+        Wavelength grid of the spectrum in the frame of the filter,
+        e.g., wave_spec_rest * (1 + z) for observed-frame photometry
+
+    wave_filter : ndarray of shape (n_filter_wave, )
+
+    trap_w : ndarray of shape (n_filter_wave, )
+        Output of _get_filter_trapz_weights
+
+    Returns
+    -------
+    spec_w : ndarray of shape (n_wave, )
+
+    """
+    idx_lo, idx_hi, w_lo, w_hi = _interp_setup(wave_filter, wave_spec)
+    spec_w = jnp.zeros_like(wave_spec)
+    spec_w = spec_w.at[idx_lo].add(trap_w * w_lo)
+    spec_w = spec_w.at[idx_hi].add(trap_w * w_hi)
+    return spec_w
+
+
+@jjit
+def _interp_setup(wave_filter, wave_spec):
+    """Indices and weights of the linear interpolation from wave_spec to wave_filter
+
+    For a fixed pair of wavelength grids, the output can be reused to interpolate
+    any number of spectra with _interp_from_setup, so that the searchsorted
+    is done only once. The result is the same as
+    jnp.interp(wave_filter, wave_spec, lum_spec, left=0, right=0)
+
+    Parameters
+    ----------
+    wave_filter : ndarray of shape (n_filter_wave, )
+
+    wave_spec : ndarray of shape (n_wave, )
+        Monotonically increasing, with n_wave >= 2
+
+    Returns
+    -------
+    idx_lo, idx_hi : ndarrays of shape (n_filter_wave, )
+        Indices of wave_spec bracketing each point of wave_filter
+
+    w_lo, w_hi : ndarrays of shape (n_filter_wave, )
+        Interpolation weights, set to zero outside the range of wave_spec
+
+    """
+    n_wave = wave_spec.shape[0]
+    if n_wave < 2:
+        msg = "wave_spec must have at least 2 points, got n_wave={0}"
+        raise ValueError(msg.format(n_wave))
+    idx_hi = jnp.searchsorted(wave_spec, wave_filter, side="right")
+    idx_hi = jnp.clip(idx_hi, 1, n_wave - 1)
+    idx_lo = idx_hi - 1
+
+    dx = wave_spec[idx_hi] - wave_spec[idx_lo]
+    dx0 = jnp.abs(dx) <= jnp.finfo(wave_spec.dtype).tiny
+    frac = (wave_filter - wave_spec[idx_lo]) / jnp.where(dx0, 1.0, dx)
+    w_hi = jnp.where(dx0, 0.0, frac)
+    w_lo = 1.0 - w_hi
+
+    msk_out = (wave_filter < wave_spec[0]) | (wave_filter > wave_spec[-1])
+    w_lo = jnp.where(msk_out, 0.0, w_lo)
+    w_hi = jnp.where(msk_out, 0.0, w_hi)
+    return idx_lo, idx_hi, w_lo, w_hi
+
+
+@jjit
+def _interp_from_setup(lum_spec, idx_lo, idx_hi, w_lo, w_hi):
+    """Interpolate lum_spec of shape (..., n_wave) using the output of _interp_setup"""
+    return lum_spec[..., idx_lo] * w_lo + lum_spec[..., idx_hi] * w_hi
+
+
 @jjit
 def _flux_ab0_at_10pc(wave_filter, trans_filter):
-    integrand = trans_filter * AB0 / wave_filter
-    lum_ab0_filter = trapz(wave_filter, integrand)
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    return _flux_ab0_from_trapz_weights(trap_w)
+
+
+@jjit
+def _flux_ab0_from_trapz_weights(trap_w):
+    lum_ab0_filter = AB0 * jnp.sum(trap_w, axis=-1)
     return lum_ab0_filter
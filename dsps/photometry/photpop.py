@@ -1,20 +1,32 @@
 """Functions used to compute photometry for collections of SEDs"""
+from functools import partial
+
 from jax import jit as jjit
-from jax import vmap
-from .photometry_kernels import calc_obs_mag, calc_rest_mag
+from jax import local_device_count, pmap, vmap
+from jax import numpy as jnp
+from .photometry_kernels import (
+    _calc_obs_mag_core,
+    _cosmological_dimming,
+    _flux_ab0_from_trapz_weights,
+    _flux_dot,
+    _get_filter_trapz_weights,
+    _get_spec_trapz_weights,
+)
 
+_get_filter_trapz_weights_vmap = jjit(vmap(_get_filter_trapz_weights, in_axes=[0, 0]))
+_cosmological_dimming_vmap = jjit(
+    vmap(_cosmological_dimming, in_axes=[0, *[None] * 4])
+)
 
-_z = [*[None] * 4, 0, *[None] * 4]
-_f = [None, None, 0, 0, None, *[None] * 4]
-_ssp = [None, 0, *[None] * 7]
-_calc_obs_mag_vmap_f = jjit(vmap(calc_obs_mag, in_axes=_f))
-_calc_obs_mag_vmap_f_ssp = jjit(
-    vmap(vmap(_calc_obs_mag_vmap_f, in_axes=_ssp), in_axes=_ssp)
+_get_spec_trapz_weights_vmap = jjit(
+    vmap(_get_spec_trapz_weights, in_axes=[None, 0, 0])
+)
+_get_spec_trapz_weights_vmap_z = jjit(
+    vmap(_get_spec_trapz_weights_vmap, in_axes=[0, None, None])
 )
-_calc_obs_mag_vmap_f_ssp_z = jjit(vmap(_calc_obs_mag_vmap_f_ssp, in_axes=_z))
 
 
-@jjit
+@partial(jjit, static_argnames=["flux_dtype"])
 def precompute_ssp_obsmags_on_z_table(
     ssp_wave,
     ssp_fluxes,
@@ -25,6 +37,7 @@ def precompute_ssp_obsmags_on_z_table(
     w0,
     wa,
     h,
+    flux_dtype=None,
 ):
     """Precompute observed magnitudes of a collection of SEDs on a redshift grid
 
@@ -57,28 +70,128 @@ def precompute_ssp_obsmags_on_z_table(
     h : float
         Hubble parameter
 
+    flux_dtype : dtype, optional
+        Reduced-precision dtype such as jnp.bfloat16 in which to compute the
+        matrix product of SEDs and filter weights. The product is accumulated
+        and returned in float32. Default is None, for full precision.
+
     Returns
     -------
     ssp_photmag_table : array of shape (n_redshift, n_met, n_age, n_filters)
 
     """
-    ssp_obsmag_table = _calc_obs_mag_vmap_f_ssp_z(
-        ssp_wave, ssp_fluxes, filter_waves, filter_trans, z_table, Om0, w0, wa, h
+    n_met, n_age, n_spec = ssp_fluxes.shape
+    ssp_fluxes = ssp_fluxes.reshape((n_met * n_age, n_spec))
+
+    n_redshift, n_filters = z_table.size, filter_waves.shape[0]
+
+    # Quantities depending only on the filters or only on redshift are computed once
+    filter_trap_w = _get_filter_trapz_weights_vmap(filter_waves, filter_trans)
+    flux_ab0 = _flux_ab0_from_trapz_weights(filter_trap_w).reshape((1, n_filters, 1))
+    dimming = _cosmological_dimming_vmap(z_table, Om0, w0, wa, h)
+    dimming = dimming.reshape((n_redshift, 1, 1))
+
+    # Filter weights on the redshifted SED grid, shape (n_redshift, n_filters, n_spec)
+    ssp_wave_obs = ssp_wave.reshape((1, -1)) * (1 + z_table.reshape((-1, 1)))
+    spec_w = _get_spec_trapz_weights_vmap_z(ssp_wave_obs, filter_waves, filter_trap_w)
+
+    # Photometry of all SSPs at all redshifts through all filters is a single GEMM
+    ssp_obsflux_table = _flux_dot(
+        spec_w.reshape((-1, n_spec)), ssp_fluxes.T, flux_dtype
     )
+    ssp_obsflux_table = ssp_obsflux_table.reshape((n_redshift, n_filters, -1))
+    ssp_obsmag_table = _calc_obs_mag_core(ssp_obsflux_table, flux_ab0, dimming)
+    ssp_obsmag_table = ssp_obsmag_table.reshape((n_redshift, n_filters, n_met, n_age))
+    ssp_obsmag_table = jnp.moveaxis(ssp_obsmag_table, 1, -1)
     return ssp_obsmag_table
 
 
-_calc_rest_mag_vmap_f = jjit(vmap(calc_rest_mag, in_axes=[None, None, 0, 0]))
-_calc_rest_mag_vmap_f_ssp = jjit(
-    vmap(
-        vmap(_calc_rest_mag_vmap_f, in_axes=[None, 0, None, None]),
-        in_axes=[None, 0, None, None],
-    )
+_precompute_ssp_obsmags_on_z_table_pmap = pmap(
+    precompute_ssp_obsmags_on_z_table,
+    in_axes=(*[None] * 4, 0, *[None] * 4),
+    static_broadcasted_argnums=(9,),
 )
 
 
-@jjit
-def precompute_ssp_restmags(ssp_wave, ssp_fluxes, filter_waves, filter_trans):
+def precompute_ssp_obsmags_on_z_table_pmap(
+    ssp_wave,
+    ssp_fluxes,
+    filter_waves,
+    filter_trans,
+    z_table,
+    Om0,
+    w0,
+    wa,
+    h,
+    flux_dtype=None,
+    n_devices=None,
+):
+    """Same as precompute_ssp_obsmags_on_z_table, but with the redshift axis
+    sharded across devices
+
+    Parameters
+    ----------
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans, z_table, Om0, w0, wa, h
+        Same as precompute_ssp_obsmags_on_z_table
+
+    flux_dtype : dtype, optional
+        Same as precompute_ssp_obsmags_on_z_table
+
+    n_devices : int, optional
+        Number of devices across which to shard z_table.
+        Default is jax.local_device_count()
+
+    Returns
+    -------
+    ssp_photmag_table : array of shape (n_redshift, n_met, n_age, n_filters)
+
+    Notes
+    -----
+    When n_redshift is not divisible by n_devices, z_table is padded with its
+    final entry, and the padded results are discarded before returning.
+
+    """
+    if n_devices is None:
+        n_devices = local_device_count()
+
+    n_redshift = jnp.shape(z_table)[0]
+    z_table_sharded = _shard_z_table(z_table, n_devices)
+
+    ssp_obsmag_table = _precompute_ssp_obsmags_on_z_table_pmap(
+        ssp_wave,
+        ssp_fluxes,
+        filter_waves,
+        filter_trans,
+        z_table_sharded,
+        Om0,
+        w0,
+        wa,
+        h,
+        flux_dtype,
+    )
+    return _unshard_z_table(ssp_obsmag_table, n_redshift)
+
+
+def _shard_z_table(z_table, n_devices):
+    """Pad z_table with its final entry and reshape to (n_devices, n_per_device)"""
+    z_table = jnp.asarray(z_table)
+    n_redshift = z_table.shape[0]
+    n_per_device = -(-n_redshift // n_devices)
+    n_pad = n_per_device * n_devices - n_redshift
+    z_table = jnp.concatenate((z_table, jnp.repeat(z_table[-1:], n_pad)))
+    return z_table.reshape((n_devices, n_per_device))
+
+
+def _unshard_z_table(sharded_table, n_redshift):
+    """Merge the two leading device axes and discard the padded redshifts"""
+    table = sharded_table.reshape((-1, *sharded_table.shape[2:]))
+    return table[:n_redshift]
+
+
+@partial(jjit, static_argnames=["flux_dtype"])
+def precompute_ssp_restmags(
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans, flux_dtype=None
+):
     """Precompute restframe magnitudes of a collection of SEDs
 
     Parameters
@@ -95,12 +208,26 @@ def precompute_ssp_restmags(ssp_wave, ssp_fluxes, filter_waves, filter_trans):
     filter_trans : array of shape (n_filters, n_trans_curve)
         Transmission curves defining fractional transmission of the filters
 
+    flux_dtype : dtype, optional
+        Reduced-precision dtype such as jnp.bfloat16 in which to compute the
+        matrix product of SEDs and filter weights. The product is accumulated
+        and returned in float32. Default is None, for full precision.
+
     Returns
     -------
     ssp_photmag_table : array of shape (n_met, n_age, n_filters)
 
     """
-    ssp_restmag_table = _calc_rest_mag_vmap_f_ssp(
-        ssp_wave, ssp_fluxes, filter_waves, filter_trans
-    )
+    n_met, n_age, n_spec = ssp_fluxes.shape
+    ssp_fluxes = ssp_fluxes.reshape((n_met * n_age, n_spec))
+    n_filters = filter_waves.shape[0]
+
+    filter_trap_w = _get_filter_trapz_weights_vmap(filter_waves, filter_trans)
+    flux_ab0 = _flux_ab0_from_trapz_weights(filter_trap_w).reshape((n_filters, 1))
+
+    spec_w = _get_spec_trapz_weights_vmap(ssp_wave, filter_waves, filter_trap_w)
+    ssp_restflux_table = _flux_dot(spec_w, ssp_fluxes.T, flux_dtype)
+    ssp_restmag_table = _calc_obs_mag_core(ssp_restflux_table, flux_ab0, 0.0)
+    ssp_restmag_table = ssp_restmag_table.reshape((n_filters, n_met, n_age))
+    ssp_restmag_table = jnp.moveaxis(ssp_restmag_table, 0, -1)
     return ssp_restmag_table
@@ -2,8 +2,19 @@
 """
 import numpy as np
 import os
+import pytest
+from jax import numpy as jnp
 from jax import jit as jjit, vmap
 from ..photometry_kernels import _calc_obs_mag_no_dimming, calc_rest_mag, calc_obs_mag
+from ..photometry_kernels import _get_filter_trapz_weights
+from ..photometry_kernels import _calc_obs_mag_tabulated, _get_distance_modulus_table
+from ..photometry_kernels import Z_DIMMING_TABLE, _get_spec_trapz_weights
+from ..photometry_kernels import _obs_flux_ssp, _obs_flux_ssp_from_trapz_weights
+from ..photometry_kernels import _rest_flux_ssp, _rest_flux_ssp_from_trapz_weights
+from ..photometry_kernels import _flux_ab0_at_10pc, _flux_ab0_from_trapz_weights
+from ..photometry_kernels import make_calc_obs_mag, AB0
+from ..photometry_kernels import _interp_setup, _interp_from_setup
+from ...utils import trapz
 from ...cosmology.flat_wcdm import FSPS_COSMO
 
 
@@ -15,6 +26,8 @@ LSST_BAND_FNPAT = "lsst_{}_transmission.npy"
 
 _a = (*[None] * 4, 0, *[None] * 4)
 _calc_obs_mag_vmap_z = jjit(vmap(calc_obs_mag, in_axes=_a))
+_b = (*[None] * 4, 0, None, None)
+_calc_obs_mag_tabulated_vmap_z = jjit(vmap(_calc_obs_mag_tabulated, in_axes=_b))
 
 
 def test_obs_mag_no_dimming_agrees_with_rest_mag_at_z0():
@@ -67,3 +80,163 @@ def test_obs_mag_agrees_with_fsps_across_redshift():
             )
 
             assert np.allclose(mag_data[band], pred_mags, atol=0.05)
+
+
+def test_get_filter_trapz_weights_agrees_with_trapz():
+    wave_filter = np.sort(np.random.uniform(1_000, 10_000, 300))
+    trans_filter = np.random.uniform(0, 1, wave_filter.size)
+    lum = np.random.uniform(0, 1, wave_filter.size)
+    trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+    assert trap_w.shape == wave_filter.shape
+    res = np.dot(lum, trap_w)
+    res_correct = trapz(wave_filter, trans_filter * lum / wave_filter)
+    assert np.allclose(res, res_correct, rtol=1e-4)
+
+
+def test_calc_obs_mag_tabulated_agrees_with_calc_obs_mag():
+    ssp_data = np.load(os.path.join(DATA_DRN, "fsps_ssp_imet_20_iage_5.npy"))
+    wave_spec = ssp_data["wave"]
+    lum_spec = ssp_data["flux"]
+
+    filter_data = np.load(os.path.join(DATA_DRN, LSST_BAND_FNPAT.format("i")))
+    band_wave = filter_data["wave"]
+    band_trans = filter_data["transmission"]
+
+    dmod_table = _get_distance_modulus_table(*FSPS_COSMO)
+    assert dmod_table.shape == Z_DIMMING_TABLE.shape
+    assert np.all(np.diff(dmod_table) > 0)
+
+    zobs_ray = np.linspace(0.01, 5, 50)
+    args = (wave_spec, lum_spec, band_wave, band_trans, zobs_ray)
+    mags_tabulated = _calc_obs_mag_tabulated_vmap_z(*args, Z_DIMMING_TABLE, dmod_table)
+    mags = _calc_obs_mag_vmap_z(
+        wave_spec, lum_spec, band_wave, band_trans, zobs_ray, *FSPS_COSMO
+    )
+    assert np.allclose(mags_tabulated, mags, atol=1e-3)
+
+
+def test_get_spec_trapz_weights_agrees_with_interpolated_integral():
+    wave_spec = np.linspace(500, 10_000, 1_000)
+    lum_spec = np.random.uniform(0, 1, wave_spec.size)
+    for wave_lo, wave_hi in ((1_000, 5_000), (200, 3_000), (8_000, 12_000)):
+        wave_filter = np.linspace(wave_lo, wave_hi, 300)
+        trans_filter = np.random.uniform(0, 1, wave_filter.size)
+        trap_w = _get_filter_trapz_weights(wave_filter, trans_filter)
+        spec_w = _get_spec_trapz_weights(wave_spec, wave_filter, trap_w)
+        assert spec_w.shape == wave_spec.shape
+        lum_on_filter = np.interp(wave_filter, wave_spec, lum_spec, left=0, right=0)
+        flux_correct = np.dot(lum_on_filter, trap_w)
+        assert np.allclose(np.dot(lum_spec, spec_w), flux_correct, rtol=1e-4)
+
+
+def test_flux_ssp_bfloat16_flux_dtype_agrees_with_float32():
+    ssp_bnames = ("fsps_ssp_imet_20_iage_5.npy", "fsps_ssp_imet_2_iage_90.npy")
+    ssp_data = [np.load(os.path.join(DATA_DRN, bn)) for bn in ssp_bnames]
+    wave_spec = ssp_data[0]["wave"]
+
+    z_obs = 0.5
+    for band in ("u", "g", "r", "i", "z", "y"):
+        filter_data = np.load(os.path.join(DATA_DRN, LSST_BAND_FNPAT.format(band)))
+        band_wave = filter_data["wave"]
+        band_trans = filter_data["transmission"]
+        trap_w = _get_filter_trapz_weights(band_wave, band_trans)
+        flux_ab0 = _flux_ab0_from_trapz_weights(trap_w)
+
+        for x in ssp_data:
+            args = wave_spec, x["flux"], band_wave, trap_w, z_obs
+            flux = _obs_flux_ssp_from_trapz_weights(*args)
+            flux_bf16 = _obs_flux_ssp_from_trapz_weights(
+                *args, flux_dtype=jnp.bfloat16
+            )
+            assert flux_bf16.dtype == jnp.float32
+            mag = -2.5 * np.log10(flux / flux_ab0)
+            mag_bf16 = -2.5 * np.log10(flux_bf16 / flux_ab0)
+            assert np.allclose(mag, mag_bf16, atol=0.01)
+
+            args = wave_spec, x["flux"], band_wave, band_trans, z_obs
+            flux_bf16_trans = _obs_flux_ssp(*args, flux_dtype=jnp.bfloat16)
+            assert np.allclose(flux_bf16_trans, flux_bf16, rtol=1e-4)
+
+            args = wave_spec, x["flux"], band_wave, trap_w
+            flux = _rest_flux_ssp_from_trapz_weights(*args)
+            flux_bf16 = _rest_flux_ssp_from_trapz_weights(
+                *args, flux_dtype=jnp.bfloat16
+            )
+            assert flux_bf16.dtype == jnp.float32
+            mag = -2.5 * np.log10(flux / flux_ab0)
+            mag_bf16 = -2.5 * np.log10(flux_bf16 / flux_ab0)
+            assert np.allclose(mag, mag_bf16, atol=0.01)
+
+            args = wave_spec, x["flux"], band_wave, band_trans
+            flux_bf16_trans = _rest_flux_ssp(*args, flux_dtype=jnp.bfloat16)
+            assert np.allclose(flux_bf16_trans, flux_bf16, rtol=1e-4)
+
+
+def test_make_calc_obs_mag_agrees_with_calc_obs_mag():
+    ssp_data = np.load(os.path.join(DATA_DRN, "fsps_ssp_imet_2_iage_90.npy"))
+    wave_spec = ssp_data["wave"]
+    lum_spec = ssp_data["flux"]
+
+    for band in ("u", "z"):
+        filter_data = np.load(os.path.join(DATA_DRN, LSST_BAND_FNPAT.format(band)))
+        band_wave = filter_data["wave"]
+        band_trans = filter_data["transmission"]
+        calc_obs_mag_band = make_calc_obs_mag(band_wave, band_trans)
+
+        for z_obs in (0.2, 2.0):
+            mag = calc_obs_mag_band(wave_spec, lum_spec, z_obs, *FSPS_COSMO)
+            mag_correct = calc_obs_mag(
+                wave_spec, lum_spec, band_wave, band_trans, z_obs, *FSPS_COSMO
+            )
+            assert np.allclose(mag, mag_correct, atol=1e-4)
+
+
+def test_interp_setup_agrees_with_interp():
+    n_sed, n_wave = 5, 1_000
+    wave_spec = np.sort(np.random.uniform(500, 10_000, n_wave))
+    lum_specs = np.random.uniform(0, 1, size=(n_sed, n_wave))
+    wave_filter = np.linspace(100, 12_000, 300)
+
+    interp_setup = _interp_setup(wave_filter, wave_spec)
+    lum_on_filter = _interp_from_setup(lum_specs, *interp_setup)
+    assert lum_on_filter.shape == (n_sed, wave_filter.size)
+    for lum_spec, res in zip(lum_specs, lum_on_filter):
+        res_correct = jnp.interp(wave_filter, wave_spec, lum_spec, left=0, right=0)
+        assert np.allclose(res, res_correct, atol=1e-5)
+
+
+def test_interp_setup_raises_for_single_point_wave_spec():
+    wave_filter = np.linspace(100, 12_000, 300)
+    with pytest.raises(ValueError):
+        _interp_setup(wave_filter, np.array([5_000.0]))
+
+
+def test_flux_kernels_taking_trans_filter_agree_with_trapz():
+    ssp_data = np.load(os.path.join(DATA_DRN, "fsps_ssp_imet_20_iage_5.npy"))
+    wave_spec = ssp_data["wave"]
+    lum_spec = ssp_data["flux"]
+
+    filter_data = np.load(os.path.join(DATA_DRN, LSST_BAND_FNPAT.format("g")))
+    band_wave = filter_data["wave"]
+    band_trans = filter_data["transmission"]
+    trap_w = _get_filter_trapz_weights(band_wave, band_trans)
+
+    for z_obs in (0.0, 1.0):
+        wave_obs = wave_spec * (1 + z_obs)
+        lum_phot = np.interp(band_wave, wave_obs, lum_spec, left=0, right=0)
+        flux_correct = trapz(band_wave, band_trans * lum_phot / band_wave)
+        flux = _obs_flux_ssp(wave_spec, lum_spec, band_wave, band_trans, z_obs)
+        assert np.allclose(flux, flux_correct, rtol=1e-4)
+        flux2 = _obs_flux_ssp_from_trapz_weights(
+            wave_spec, lum_spec, band_wave, trap_w, z_obs
+        )
+        assert np.allclose(flux, flux2)
+
+    flux = _rest_flux_ssp(wave_spec, lum_spec, band_wave, band_trans)
+    flux2 = _rest_flux_ssp_from_trapz_weights(wave_spec, lum_spec, band_wave, trap_w)
+    assert np.allclose(flux, flux2)
+
+    flux_ab0_correct = trapz(band_wave, band_trans * AB0 / band_wave)
+    flux_ab0 = _flux_ab0_at_10pc(band_wave, band_trans)
+    assert np.allclose(flux_ab0, flux_ab0_correct, rtol=1e-4)
+    assert np.allclose(flux_ab0, _flux_ab0_from_trapz_weights(trap_w))
@@ -1,8 +1,21 @@
 """
 """
 import numpy as np
+from jax import numpy as jnp
+from ..photometry_kernels import calc_obs_mag, calc_rest_mag
 from ..photpop import precompute_ssp_restmags
 from ..photpop import precompute_ssp_obsmags_on_z_table
+from ..photpop import precompute_ssp_obsmags_on_z_table_pmap
+from ..photpop import _shard_z_table, _unshard_z_table
+
+
+def _get_fake_ssp_and_filter_data(n_met=3, n_age=4, n_filters=2, n_wave=1_000):
+    ssp_wave = np.linspace(500, 10_000, n_wave)
+    ssp_fluxes = np.random.uniform(0, 1, size=(n_met, n_age, n_wave))
+    filter_wave = np.linspace(1_000, 5_000, 200)
+    filter_waves = np.array([filter_wave * (i + 1) for i in range(n_filters)])
+    filter_trans = np.array([np.ones(filter_wave.size) for i in range(n_filters)])
+    return ssp_wave, ssp_fluxes, filter_waves, filter_trans
 
 
 def test_precompute_ssp_restmags():
@@ -38,3 +51,97 @@ def test_precompute_ssp_obsmags_on_z_table():
     assert ssp_obsmags.shape == (n_redshift, n_met, n_age, n_filters)
     assert np.all(np.isfinite(ssp_obsmags))
     assert not np.all(ssp_obsmags == 0)
+
+
+def test_precompute_ssp_obsmags_on_z_table_agrees_with_calc_obs_mag():
+    cosmology = 0.3, -1.0, 0.0, 0.67
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans = _get_fake_ssp_and_filter_data()
+    n_met, n_age = ssp_fluxes.shape[:2]
+    n_filters = filter_waves.shape[0]
+    z_table = np.array((0.1, 1.0))
+    ssp_obsmags = precompute_ssp_obsmags_on_z_table(
+        ssp_wave, ssp_fluxes, filter_waves, filter_trans, z_table, *cosmology
+    )
+    for iz, z in enumerate(z_table):
+        for imet in range(n_met):
+            for iage in range(n_age):
+                for ifilter in range(n_filters):
+                    mag = calc_obs_mag(
+                        ssp_wave,
+                        ssp_fluxes[imet, iage],
+                        filter_waves[ifilter],
+                        filter_trans[ifilter],
+                        z,
+                        *cosmology,
+                    )
+                    assert np.allclose(
+                        ssp_obsmags[iz, imet, iage, ifilter], mag, atol=1e-4
+                    )
+
+
+def test_precompute_ssp_restmags_agrees_with_calc_rest_mag():
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans = _get_fake_ssp_and_filter_data()
+    n_met, n_age = ssp_fluxes.shape[:2]
+    n_filters = filter_waves.shape[0]
+    ssp_restmags = precompute_ssp_restmags(
+        ssp_wave, ssp_fluxes, filter_waves, filter_trans
+    )
+    for imet in range(n_met):
+        for iage in range(n_age):
+            for ifilter in range(n_filters):
+                mag = calc_rest_mag(
+                    ssp_wave,
+                    ssp_fluxes[imet, iage],
+                    filter_waves[ifilter],
+                    filter_trans[ifilter],
+                )
+                assert np.allclose(ssp_restmags[imet, iage, ifilter], mag, atol=1e-4)
+
+
+def test_precompute_ssp_obsmags_on_z_table_pmap_agrees_with_vmap():
+    cosmology = 0.3, -1.0, 0.0, 0.67
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans = _get_fake_ssp_and_filter_data()
+    n_met, n_age = ssp_fluxes.shape[:2]
+    n_filters = filter_waves.shape[0]
+    z_table = np.linspace(0.1, 2.0, 5)
+    args = ssp_wave, ssp_fluxes, filter_waves, filter_trans, z_table, *cosmology
+    ssp_obsmags = precompute_ssp_obsmags_on_z_table(*args)
+    ssp_obsmags_pmap = precompute_ssp_obsmags_on_z_table_pmap(*args)
+    assert ssp_obsmags_pmap.shape == (z_table.size, n_met, n_age, n_filters)
+    assert np.allclose(ssp_obsmags, ssp_obsmags_pmap, atol=1e-4)
+
+
+def test_shard_z_table_pads_and_unshard_trims():
+    n_devices = 4
+    for n_redshift in (1, 3, 4, 5, 7):
+        z_table = np.linspace(0.1, 2.0, n_redshift)
+        z_table_sharded = _shard_z_table(z_table, n_devices)
+        n_per_device = -(-n_redshift // n_devices)
+        assert z_table_sharded.shape == (n_devices, n_per_device)
+
+        z_flat = np.array(z_table_sharded).flatten()
+        assert np.allclose(z_flat[:n_redshift], z_table)
+        assert np.all(z_flat[n_redshift:] == z_flat[n_redshift - 1])
+
+        fake_table = np.stack((z_table_sharded, 2 * z_table_sharded), axis=-1)
+        table = _unshard_z_table(fake_table, n_redshift)
+        assert table.shape == (n_redshift, 2)
+        assert np.allclose(table[:, 0], z_table)
+        assert np.allclose(table[:, 1], 2 * z_table)
+
+
+def test_precompute_ssp_mags_bfloat16_flux_dtype_agrees_with_default():
+    cosmology = 0.3, -1.0, 0.0, 0.67
+    ssp_wave, ssp_fluxes, filter_waves, filter_trans = _get_fake_ssp_and_filter_data()
+    z_table = np.linspace(0.1, 2.0, 5)
+    args = ssp_wave, ssp_fluxes, filter_waves, filter_trans, z_table, *cosmology
+    ssp_obsmags = precompute_ssp_obsmags_on_z_table(*args)
+    ssp_obsmags_bf16 = precompute_ssp_obsmags_on_z_table(
+        *args, flux_dtype=jnp.bfloat16
+    )
+    assert np.allclose(ssp_obsmags, ssp_obsmags_bf16, atol=0.01)
+
+    args = ssp_wave, ssp_fluxes, filter_waves, filter_trans
+    ssp_restmags = precompute_ssp_restmags(*args)
+    ssp_restmags_bf16 = precompute_ssp_restmags(*args, flux_dtype=jnp.bfloat16)
+    assert np.allclose(ssp_restmags, ssp_restmags_bf16, atol=0.01)
@@ -102,10 +102,8 @@ def calc_rest_sed_sfh_table_lognormal_mdf(
         ssp_lg_age_gyr,
         t_obs,
     )
-    n_met, n_ages = weights.shape
-    sed_unit_mstar = jnp.sum(
-        ssp_flux * weights.reshape((n_met, n_ages, 1)), axis=(0, 1)
-    )
+    # Contract over (n_met, n_ages) without materializing weights * ssp_flux
+    sed_unit_mstar = jnp.tensordot(weights, ssp_flux, axes=2)
 
     lgt_obs = jnp.log10(t_obs)
     lgt_table = jnp.log10(gal_t_table)
@@ -185,10 +183,8 @@ def calc_rest_sed_sfh_table_met_table(
         ssp_lg_age_gyr,
         t_obs,
     )
-    n_met, n_ages = weights.shape
-    sed_unit_mstar = jnp.sum(
-        ssp_flux * weights.reshape((n_met, n_ages, 1)), axis=(0, 1)
-    )
+    # Contract over (n_met, n_ages) without materializing weights * ssp_flux
+    sed_unit_mstar = jnp.tensordot(weights, ssp_flux, axes=2)
 
     lgt_obs = jnp.log10(t_obs)
     lgt_table = jnp.log10(gal_t_table)
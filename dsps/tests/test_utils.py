@@ -3,7 +3,9 @@
 
 import numpy as np
 import pytest
+from jax import jit as jjit
 from jax import random as jran
+from jax import vmap
 
 from ..constants import T_TABLE_MIN
 from ..utils import (
@@ -32,6 +34,10 @@ except ImportError:
 
 MSG_HAS_SCIPY = "Must have scipy installed to run this test"
 
+_get_triweights_singlepoint_vmap = jjit(
+    vmap(_get_triweights_singlepoint, in_axes=[0, 0, 0])
+)
+
 
 def test_sigmoid_inversion():
     xarr = np.linspace(-100, 100, 500)
@@ -78,14 +84,13 @@ def test_get_triweights_singlepoint_x_correctly_normalized():
     ran_key = jran.PRNGKey(0)
     n_bins = 4
     n_tests = 1000
-    for itest in range(n_tests):
-        ran_key, x_key, sig_key, edges_key = jran.split(ran_key, 4)
-        x = jran.uniform(x_key, minval=-1, maxval=2)
-        sig = jran.uniform(sig_key, minval=1, maxval=20)
-        bin_edges = jran.uniform(edges_key, minval=-1, maxval=2, shape=(n_bins,))
-        weights = _get_triweights_singlepoint(x, sig, bin_edges)
-        assert weights.shape == (n_bins - 1,)
-        assert np.allclose(weights.sum(), 1.0, atol=0.001)
+    x_key, sig_key, edges_key = jran.split(ran_key, 3)
+    x = jran.uniform(x_key, minval=-1, maxval=2, shape=(n_tests,))
+    sig = jran.uniform(sig_key, minval=1, maxval=20, shape=(n_tests,))
+    bin_edges = jran.uniform(edges_key, minval=-1, maxval=2, shape=(n_tests, n_bins))
+    weights = _get_triweights_singlepoint_vmap(x, sig, bin_edges)
+    assert weights.shape == (n_tests, n_bins - 1)
+    assert np.allclose(weights.sum(axis=1), 1.0, atol=0.001)
 
 
 def test_get_bin_edges():
@@ -108,11 +113,13 @@ def test_weight_matrix_kernels_2d():
 
     res = _mult_2d_vmap(w1arr, w2arr)
     assert res.shape == (n1, n2)
+    assert np.allclose(res, np.einsum("i,j->ij", w1arr, w2arr))
 
     w1arr_pop = np.random.uniform(0, 1, size=(ngals, n1))
     w2arr_pop = np.random.uniform(0, 1, size=(ngals, n2))
     res_vmap = _get_weight_matrices_2d(w1arr_pop, w2arr_pop)
     assert res_vmap.shape == (ngals, n1, n2)
+    assert np.allclose(res_vmap, np.einsum("gi,gj->gij", w1arr_pop, w2arr_pop))
 
 
 def test_weight_matrix_kernels_3d():
@@ -127,12 +134,15 @@ def test_weight_matrix_kernels_3d():
 
     res = _mult_3d_vmap(w1arr, w2arr, w3arr)
     assert res.shape == (n1, n2, n3)
+    assert np.allclose(res, np.einsum("i,j,k->ijk", w1arr, w2arr, w3arr))
 
     w1arr_pop = np.random.uniform(0, 1, size=(ngals, n1))
     w2arr_pop = np.random.uniform(0, 1, size=(ngals, n2))
     w3arr_pop = np.random.uniform(0, 1, size=(ngals, n3))
     res_vmap = _get_weight_matrices_3d(w1arr_pop, w2arr_pop, w3arr_pop)
     assert res_vmap.shape == (ngals, n1, n2, n3)
+    res_correct = np.einsum("gi,gj,gk->gijk", w1arr_pop, w2arr_pop, w3arr_pop)
+    assert np.allclose(res_vmap, res_correct)
 
 
 def test_powerlaw_rvs():